@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark for cc_switcher's cross-process locking.
+
+Starts N processes that each perform K switches against a temporary
+~/.claude-like directory: every switch copies a profile over settings.json
+and increments a switch counter in the app state file, just like the app does.
+With locking, the final counter must equal N * K and settings.json must always
+be a complete profile.
+
+    python bench_locking.py --workers 8 --switches 200
+    python bench_locking.py --unlocked   # show what gets lost without the lock
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from multiprocessing import Pool
+
+import cc_switcher
+
+
+class NoLock:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+def bump_counter(state):
+    state["switches"] = state.get("switches", 0) + 1
+
+
+def run_switcher(args):
+    """One worker: switch K times, then report its lock-wait metrics"""
+    claude_dir, worker_id, switches, locked = args
+    claude_dir = Path(claude_dir)
+    settings_file = claude_dir / "settings.json"
+    state_file = claude_dir / ".cc-cache"
+    profiles = sorted(claude_dir.glob("profile_*_settings.json"))
+
+    for i in range(switches):
+        lock = cc_switcher.state_lock(claude_dir, timeout=30) if locked else NoLock()
+        profile = profiles[(worker_id + i) % len(profiles)]
+        with lock:
+            cc_switcher.atomic_copy(profile, settings_file)
+        lock = cc_switcher.state_lock(claude_dir, timeout=30) if locked else NoLock()
+        cc_switcher.update_json_file(state_file, bump_counter, lock)
+
+    return cc_switcher.lock_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent switch stress test for cc_switcher locking")
+    parser.add_argument("--workers", type=int, default=8, help="number of concurrent switcher processes")
+    parser.add_argument("--switches", type=int, default=100, help="switches per process")
+    parser.add_argument("--unlocked", action="store_true", help="run without the lock for comparison")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        claude_dir = Path(tmp)
+        profiles = []
+        for i in range(4):
+            profile = {"env": {"ANTHROPIC_BASE_URL": f"https://gateway-{i}.example.com"}, "padding": "x" * 4096}
+            (claude_dir / f"profile_{i}_settings.json").write_text(json.dumps(profile), encoding="utf-8")
+            profiles.append(profile)
+
+        jobs = [(str(claude_dir), worker_id, args.switches, not args.unlocked) for worker_id in range(args.workers)]
+        start = time.perf_counter()
+        with Pool(args.workers) as pool:
+            stats = pool.map(run_switcher, jobs)
+        elapsed = time.perf_counter() - start
+
+        expected = args.workers * args.switches
+        state = json.loads((claude_dir / ".cc-cache").read_text(encoding="utf-8"))
+        settings_ok = json.loads((claude_dir / "settings.json").read_text(encoding="utf-8")) in profiles
+
+        acquired = sum(s["acquired"] for s in stats)
+        total_wait = sum(s["total_wait"] for s in stats)
+        print(f"workers={args.workers} switches/worker={args.switches} locked={not args.unlocked}")
+        print(f"elapsed: {elapsed:.2f} s ({expected / elapsed:.0f} switches/s)")
+        print(f"recorded switches: {state.get('switches', 0)} / {expected}")
+        print(f"settings.json intact: {settings_ok}")
+        if acquired:
+            print(f"lock acquisitions: {acquired}, timeouts: {sum(s['timeouts'] for s in stats)}")
+            print(f"lock wait: mean {total_wait / acquired * 1000:.2f} ms, "
+                  f"max {max(s['max_wait'] for s in stats) * 1000:.2f} ms")
+
+        return 0 if state.get("switches") == expected and settings_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ echo Claude Config Switcher Build Tool
 echo ========================================
 
 echo Running build script...
-python build_exe.py
+python build_exe.py %*
 
 if %ERRORLEVEL% EQU 0 (
     echo.
@@ -4,11 +4,41 @@ Claude Config Switcher打包脚本
 使用PyInstaller将cc_switcher.py打包成exe文件
 """
 
+import os
 import sys
+import time
+import zlib
+import struct
+import argparse
 import subprocess
 import shutil
 from pathlib import Path
 
+APP_NAME = "ClaudeConfigSwitcher"
+
+# 应用未使用的标准库/Tk模块，排除后可减小包体并加快启动
+EXCLUDED_MODULES = [
+    "unittest",
+    "doctest",
+    "pydoc",
+    "pdb",
+    "idlelib",
+    "lib2to3",
+    "turtle",
+    "turtledemo",
+    "tkinter.test",
+    "test",
+    "sqlite3",
+    "curses",
+    "distutils",
+    "setuptools",
+    "pip",
+]
+
+# 启动画面默认尺寸与颜色（与应用深色主题一致）
+SPLASH_SIZE = (360, 120)
+SPLASH_COLOR = (0x1a, 0x1a, 0x1a)
+
 
 def check_pyinstaller():
     """检查PyInstaller是否已安装"""
@@ -36,7 +66,82 @@ def install_pyinstaller():
         return False
 
 
-def build_exe():
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Claude Config Switcher 打包工具")
+    parser.add_argument(
+        "--mode",
+        choices=["onefile", "onedir"],
+        default="onefile",
+        help="onefile: 单个exe（每次启动需解压）; onedir: 目录包（启动更快）",
+    )
+    parser.add_argument(
+        "--splash",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="IMAGE",
+        help="显示PyInstaller启动画面，可指定PNG图片，省略时自动生成",
+    )
+    parser.add_argument(
+        "--optimize",
+        type=int,
+        choices=[0, 1, 2],
+        default=None,
+        help="以指定优化级别预编译字节码（2会去掉assert和docstring）",
+    )
+    parser.add_argument("--no-exclude", action="store_true", help="不排除未使用的标准库模块")
+    parser.add_argument("--no-measure", action="store_true", help="打包后不测量冷启动时间")
+    parser.add_argument("--measure-runs", type=int, default=3, help="冷启动测量次数")
+    return parser.parse_args()
+
+
+def write_splash_image(path, size=SPLASH_SIZE, color=SPLASH_COLOR):
+    """生成纯色PNG启动画面图片"""
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    width, height = size
+    row = b"\x00" + bytes(color) * width
+    png = b"\x89PNG\r\n\x1a\n"
+    png += chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    png += chunk(b"IDAT", zlib.compress(row * height, 9))
+    png += chunk(b"IEND", b"")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(png)
+    return path
+
+
+def bundle_size(path):
+    """计算文件或目录的总大小（字节）"""
+    if path.is_file():
+        return path.stat().st_size
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def measure_cold_start(exe_path, runs=3):
+    """多次启动exe并计时，应用在窗口就绪后会自动退出"""
+    # 探测模式下应用跳过单实例转交，即使用户已打开应用也会真实启动
+    env = dict(os.environ, CC_SWITCHER_STARTUP_PROBE="1")
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        try:
+            result = subprocess.run([str(exe_path)], env=env, timeout=120, check=False)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"✗ 冷启动测量失败: {e}")
+            return None
+        if result.returncode != 0:
+            # 崩溃退出不能算作快速启动
+            print(f"✗ 冷启动测量失败: 应用退出码 {result.returncode}")
+            return None
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def build_exe(args):
     """打包exe文件"""
     script_dir = Path(__file__).parent
     script_path = script_dir / "cc_switcher.py"
@@ -45,34 +150,61 @@ def build_exe():
         print(f"✗ 找不到脚本文件: {script_path}")
         return False
 
-    print(f"正在打包: {script_path}")
+    print(f"正在打包: {script_path} (模式: {args.mode})")
 
     # PyInstaller命令参数
     cmd = [
         "pyinstaller",
-        "--onefile",  # 打包成单个exe文件
+        f"--{args.mode}",  # 单个exe文件或目录包
         "--windowed",  # 无控制台窗口
+        "--noconfirm",  # 覆盖已有的输出目录
         "--name",
-        "ClaudeConfigSwitcher",  # 输出文件名
+        APP_NAME,  # 输出文件名
         "--distpath",
         str(script_dir / "dist"),  # 输出目录
         "--workpath",
         str(script_dir / "build"),  # 临时文件目录
         "--specpath",
         str(script_dir),  # spec文件目录
-        str(script_path),
     ]
 
+    if not args.no_exclude:
+        for module in EXCLUDED_MODULES:
+            cmd += ["--exclude-module", module]
+
+    if args.splash is not None:
+        splash_path = Path(args.splash) if args.splash else write_splash_image(script_dir / "build" / "splash.png")
+        cmd += ["--splash", str(splash_path)]
+
+    if args.optimize is not None:
+        cmd += ["--optimize", str(args.optimize)]
+
+    cmd.append(str(script_path))
+
+    exe_name = f"{APP_NAME}.exe" if sys.platform == "win32" else APP_NAME
+    if args.mode == "onedir":
+        bundle_path = script_dir / "dist" / APP_NAME
+        exe_path = bundle_path / exe_name
+    else:
+        bundle_path = exe_path = script_dir / "dist" / exe_name
+
     try:
         print("开始打包...")
         result = subprocess.run(cmd, capture_output=True, text=True, cwd=script_dir)
 
         if result.returncode == 0:
-            exe_path = script_dir / "dist" / "ClaudeConfigSwitcher.exe"
             if exe_path.exists():
                 print("✓ 打包成功!")
                 print(f"  可执行文件位置: {exe_path}")
-                print(f"  文件大小: {exe_path.stat().st_size / 1024 / 1024:.1f} MB")
+                print(f"  包体大小: {bundle_size(bundle_path) / 1024 / 1024:.1f} MB")
+
+                if not args.no_measure:
+                    print("测量冷启动时间...")
+                    timings = measure_cold_start(exe_path, args.measure_runs)
+                    if timings:
+                        print(f"  首次启动: {timings[0] * 1000:.0f} ms")
+                        if len(timings) > 1:
+                            print(f"  后续最快: {min(timings[1:]) * 1000:.0f} ms")
                 return True
             else:
                 print("✗ 打包完成但找不到exe文件")
@@ -95,7 +227,7 @@ def clean_build_files():
     script_dir = Path(__file__).parent
 
     # 要清理的目录和文件
-    cleanup_paths = [script_dir / "build", script_dir / "__pycache__", script_dir / "ClaudeConfigSwitcher.spec"]
+    cleanup_paths = [script_dir / "build", script_dir / "__pycache__", script_dir / f"{APP_NAME}.spec"]
 
     print("清理构建文件...")
     for path in cleanup_paths:
@@ -110,6 +242,8 @@ def clean_build_files():
 
 def main():
     """主函数"""
+    args = parse_args()
+
     print("=" * 50)
     print("Claude Config Switcher 打包工具")
     print("=" * 50)
@@ -160,7 +294,7 @@ def main():
 
     # 开始打包
     print("\n" + "=" * 30)
-    success = build_exe()
+    success = build_exe(args)
 
     # 打包成功后自动清理构建文件
     if success:
@@ -1,12 +1,50 @@
-import customtkinter as ctk
 import os
+import sys
+import ssl
+import asyncio
 import shutil
+import re
 import json
+import mmap
+import queue
+import getpass
+import hashlib
+import argparse
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client, answer_challenge, deliver_challenge
+from urllib.parse import urlsplit
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING
+
+try:
+    import fcntl
+except ImportError:  # Windows: FileLock uses msvcrt byte-range locks instead
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+if TYPE_CHECKING:
+    import customtkinter as ctk
+
+
+def load_gui():
+    """Import customtkinter on first use, so launches that only forward a command skip the Tk startup cost"""
+    global ctk
+    if "ctk" in globals():
+        return
+    import customtkinter as ctk
+    ctk.set_appearance_mode("dark")
+    ctk.set_default_color_theme("dark-blue")
 
-ctk.set_appearance_mode("dark")
-ctk.set_default_color_theme("dark-blue")
 
 # Modern card-style color schemes
 DARK_COLORS = {
@@ -48,9 +86,1240 @@ LIGHT_COLORS = {
 # Default to dark theme
 COLORS = DARK_COLORS
 
+CLAUDE_DIR = Path.home() / ".claude"
+
+# Single-instance IPC: overall timeout for a forwarded command, and message limits
+IPC_TIMEOUT = 1.0
+IPC_KEY_SIZE = 32
+IPC_MAX_MESSAGE = 64 * 1024
+INSTANCE_ELECTION_RETRIES = 10
+
+# Resident mode: hotkey that switches to the next profile, and how often the warm index is re-synced
+DEFAULT_HOTKEY = "ctrl+alt+s"
+RESIDENT_RESCAN_INTERVAL = 5.0
+
+# Files larger than this are previewed as raw text through a memory map instead of being parsed
+PREVIEW_SIZE_LIMIT = 1024 * 1024
+# Lines (and a byte cap for huge single-line files) shown per "Load more" step
+PREVIEW_CHUNK_LINES = 500
+PREVIEW_CHUNK_BYTES = 256 * 1024
+
+# Known Claude Code settings keys and the JSON type each one expects
+KNOWN_SETTINGS_KEYS = {
+    "$schema": str,
+    "apiKeyHelper": str,
+    "awsAuthRefresh": str,
+    "awsCredentialExport": str,
+    "cleanupPeriodDays": int,
+    "companyAnnouncements": list,
+    "disableAllHooks": bool,
+    "disabledMcpjsonServers": list,
+    "enableAllProjectMcpServers": bool,
+    "enabledMcpjsonServers": list,
+    "env": dict,
+    "forceLoginMethod": str,
+    "forceLoginOrgUUID": str,
+    "hooks": dict,
+    "includeCoAuthoredBy": bool,
+    "model": str,
+    "otelHeadersHelper": str,
+    "outputStyle": str,
+    "permissions": dict,
+    "sandbox": dict,
+    "spinnerTipsEnabled": bool,
+    "statusLine": dict,
+    "alwaysThinkingEnabled": bool
+}
+
+
+def validate_settings(data):
+    """Check parsed settings against the known keys; returns (level, message) with level ok/warning/error"""
+    if not isinstance(data, dict):
+        return ("error", "Settings must be a JSON object")
+
+    for key, value in data.items():
+        expected = KNOWN_SETTINGS_KEYS.get(key)
+        if expected is not None and not isinstance(value, expected):
+            return ("error", f"'{key}' should be of type {expected.__name__}")
+
+    env = data.get("env", {})
+    for name, value in env.items():
+        if not isinstance(value, str):
+            return ("warning", f"env.{name} should be a string")
+
+    unknown = [key for key in data if key not in KNOWN_SETTINGS_KEYS]
+    if unknown:
+        return ("warning", f"Unknown key: {', '.join(unknown)}")
+    return ("ok", "")
+
+
+# Profile templates: one file rendering several concrete settings variants
+TEMPLATE_SUFFIX = ".template.json"
+TEMPLATE_VAR_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+RENDER_CACHE_SIZE = 256
+
+# (template content hash, variables JSON) -> (settings text, settings data)
+_render_cache = {}
+# Templates are validated on the index's worker threads, so the cache is shared between them
+_render_cache_guard = threading.Lock()
+
+
+def is_template_file(path):
+    return path.name.lower().endswith(TEMPLATE_SUFFIX)
+
+
+def substitute_template(node, variables):
+    """Replace ${NAME} placeholders in string values; a string that is only a placeholder takes the raw value"""
+    if isinstance(node, dict):
+        return {key: substitute_template(value, variables) for key, value in node.items()}
+    if isinstance(node, list):
+        return [substitute_template(value, variables) for value in node]
+    if not isinstance(node, str):
+        return node
+
+    def lookup(name):
+        if name not in variables:
+            raise ValueError(f"Undefined template variable: {name}")
+        return variables[name]
+
+    whole = TEMPLATE_VAR_PATTERN.fullmatch(node)
+    if whole:
+        return lookup(whole.group(1))
+    return TEMPLATE_VAR_PATTERN.sub(lambda match: str(lookup(match.group(1))), node)
+
+
+def render_template(template_doc, template_hash, variant):
+    """Render one variant of a template to (settings text, settings data), memoized by hash and variables"""
+    variables = dict(template_doc.get("variables", {}))
+    variables.update(template_doc["variants"][variant])
+    cache_key = (template_hash, json.dumps(variables, sort_keys=True))
+    with _render_cache_guard:
+        cached = _render_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    data = substitute_template(template_doc["template"], variables)
+    rendered = (json.dumps(data, indent=2, ensure_ascii=False) + "\n", data)
+    with _render_cache_guard:
+        if cache_key not in _render_cache and len(_render_cache) >= RENDER_CACHE_SIZE:
+            _render_cache.pop(next(iter(_render_cache)))
+        _render_cache[cache_key] = rendered
+    return rendered
+
+
+def validate_template(template_doc, template_hash):
+    """Check a template's structure and validate every rendered variant
+
+    Returns the template file's overall (level, message) plus a {variant: (level, message)} map
+    of each variant's own result, which is empty when the template cannot be expanded.
+    """
+    if not isinstance(template_doc, dict):
+        return ("error", "Template must be a JSON object"), {}
+    if not isinstance(template_doc.get("template"), dict):
+        return ("error", "Template needs a 'template' object"), {}
+    if not isinstance(template_doc.get("variables", {}), dict):
+        return ("error", "'variables' should be of type dict"), {}
+    variants = template_doc.get("variants")
+    if not isinstance(variants, dict) or not variants:
+        return ("error", "Template needs a non-empty 'variants' object"), {}
+
+    result = ("ok", "")
+    variant_results = {}
+    for variant, variables in variants.items():
+        if not isinstance(variables, dict):
+            return ("error", f"Variant '{variant}' should be of type dict"), {}
+        try:
+            _, data = render_template(template_doc, template_hash, variant)
+        except ValueError as e:
+            return ("error", f"{variant}: {e}"), {}
+        level, message = validate_settings(data)
+        if level == "error":
+            return (level, f"{variant}: {message}"), {}
+        if level == "warning" and result[0] == "ok":
+            result = (level, f"{variant}: {message}")
+        variant_results[variant] = (level, message)
+    return result, variant_results
+
+
+class TemplateProfile:
+    """One variant of a profile template, rendered to concrete settings when previewed or switched to"""
+
+    def __init__(self, path, variant):
+        self.path = path
+        self.variant = variant
+
+    def exists(self):
+        return self.path.exists()
+
+    def __eq__(self, other):
+        if not isinstance(other, TemplateProfile):
+            return NotImplemented
+        return (self.path, self.variant) == (other.path, other.variant)
+
+    def __hash__(self):
+        return hash((self.path, self.variant))
+
+
+def profile_file(profile):
+    """Return the file backing a profile, which is the template file for template variants"""
+    return profile.path if isinstance(profile, TemplateProfile) else profile
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a FileLock cannot be acquired within its timeout"""
+
+
+# Seconds a writer waits for the lock before giving up
+LOCK_TIMEOUT = 2.0
+# Fallback lockfiles older than this are assumed to be left behind by a crashed process
+LOCK_STALE_AFTER = 30.0
+LOCK_POLL_INTERVAL = 0.005
+
+# Lock-wait metrics for this process
+LOCK_STATS = {"acquired": 0, "timeouts": 0, "total_wait": 0.0, "max_wait": 0.0}
+_lock_stats_guard = threading.Lock()
+
+
+class FileLock:
+    """Advisory cross-process lock: fcntl.flock or msvcrt.locking, with an exclusive lockfile as a last resort"""
+
+    def __init__(self, path, timeout=LOCK_TIMEOUT):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._fd = None
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        while not self._try_acquire():
+            if time.monotonic() >= deadline:
+                with _lock_stats_guard:
+                    LOCK_STATS["timeouts"] += 1
+                raise LockTimeout(f"Timed out waiting for {self.path}")
+            time.sleep(LOCK_POLL_INTERVAL)
+
+        waited = time.monotonic() - start
+        with _lock_stats_guard:
+            LOCK_STATS["acquired"] += 1
+            LOCK_STATS["total_wait"] += waited
+            LOCK_STATS["max_wait"] = max(LOCK_STATS["max_wait"], waited)
+
+    def _try_acquire(self):
+        if fcntl is not None or msvcrt is not None:
+            # OS-level locks are released by the kernel if the holder dies, so they never go stale
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            except OSError:
+                os.close(fd)
+                return False
+            self._fd = fd
+            return True
+
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            self._break_stale_lockfile()
+            return False
+        os.write(fd, str(os.getpid()).encode('ascii'))
+        self._fd = fd
+        return True
+
+    def _break_stale_lockfile(self):
+        """Move an abandoned lockfile aside; the rename guarantees only one waiter breaks a given lock"""
+        try:
+            st = self.path.stat()
+            if time.time() - st.st_mtime <= LOCK_STALE_AFTER:
+                return
+            stale_name = f"{self.path}.stale-{os.getpid()}-{threading.get_ident()}"
+            os.rename(self.path, stale_name)
+        except OSError:
+            return
+        try:
+            moved = os.stat(stale_name)
+            if (moved.st_ino, moved.st_mtime_ns) != (st.st_ino, st.st_mtime_ns):
+                # Another waiter broke the stale lock first and we moved its fresh one: put it back
+                os.link(stale_name, self.path)
+        except OSError:
+            pass
+        finally:
+            try:
+                os.unlink(stale_name)
+            except OSError:
+                pass
+
+    def release(self):
+        if self._fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        elif msvcrt is not None:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            os.close(self._fd)
+        else:
+            os.close(self._fd)
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+        self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def state_lock(claude_dir=CLAUDE_DIR, timeout=LOCK_TIMEOUT):
+    """The lock every writer of settings.json and .cc-cache goes through"""
+    return FileLock(claude_dir / ".cc-switcher.lock", timeout)
+
+
+def lock_stats():
+    """Snapshot of this process's lock-wait metrics"""
+    with _lock_stats_guard:
+        return dict(LOCK_STATS)
+
+
+def _atomic_replace(path, fill):
+    """Let fill(tmp_name) populate a temp file next to path, then atomically rename it over path"""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        fill(tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path, text):
+    """Write text to path through a temp file in the same directory and an atomic rename"""
+    def fill(tmp_name):
+        with open(tmp_name, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+    _atomic_replace(path, fill)
+
+
+def atomic_copy(src, path):
+    """Copy src over path (keeping metadata like shutil.copy2) with an atomic rename"""
+    _atomic_replace(path, lambda tmp_name: shutil.copy2(src, tmp_name))
+
+
+def update_json_file(path, mutate, lock):
+    """Read-modify-write a JSON object file under lock, so concurrent updates are never lost"""
+    with lock:
+        _update_json_file_locked(path, mutate)
+
+
+def _update_json_file_locked(path, mutate):
+    """update_json_file for callers that already hold the lock"""
+    state = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        pass
+    if not isinstance(state, dict):
+        state = {}
+    mutate(state)
+    atomic_write_text(path, json.dumps(state, indent=2))
+
+
+# Endpoint latency probing
+DEFAULT_BASE_URL = "https://api.anthropic.com"
+PROBE_TIMEOUT = 5.0
+PROBE_CONCURRENCY = 8
+# Seconds a probe result is reused before the endpoint is probed again
+PROBE_TTL = 300.0
+
+
+async def probe_endpoint(url, timeout=PROBE_TIMEOUT):
+    """Time TCP connect, TLS handshake and first response byte of one base URL"""
+    result = {"url": url, "connect": None, "tls": None, "first_byte": None,
+              "status": None, "healthy": False, "error": None}
+    writer = None
+    start = time.perf_counter()
+    try:
+        parts = urlsplit(url)
+        use_tls = parts.scheme == "https"
+        host = parts.hostname
+        if not host or parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if use_tls else 80)
+
+        async with asyncio.timeout(timeout):
+            reader, writer = await asyncio.open_connection(host, port)
+            result["connect"] = time.perf_counter() - start
+            if use_tls:
+                await writer.start_tls(ssl.create_default_context(), server_hostname=host)
+                result["tls"] = time.perf_counter() - start
+
+            host_header = host if parts.port is None else f"{host}:{parts.port}"
+            writer.write((f"HEAD {parts.path or '/'} HTTP/1.1\r\nHost: {host_header}\r\n"
+                          f"User-Agent: cc-switcher\r\nConnection: close\r\n\r\n").encode('ascii'))
+            await writer.drain()
+
+            first = await reader.read(1)
+            if not first:
+                raise ConnectionError("Connection closed without a response")
+            result["first_byte"] = time.perf_counter() - start
+            status_line = first + await reader.readline()
+            result["status"] = int(status_line.split()[1])
+            # Any answer below 500 means the gateway is up, even if / itself is not a valid route
+            result["healthy"] = result["status"] < 500
+    except (OSError, TimeoutError, ssl.SSLError, ValueError, IndexError, UnicodeError) as e:
+        result["error"] = str(e) or type(e).__name__
+    finally:
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+    return result
+
+
+async def probe_endpoints(urls, concurrency=PROBE_CONCURRENCY, timeout=PROBE_TIMEOUT):
+    """Probe several base URLs concurrently, at most concurrency at a time; returns {url: result}"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(url):
+        async with semaphore:
+            return await probe_endpoint(url, timeout)
+
+    results = await asyncio.gather(*(bounded(url) for url in urls))
+    return {result["url"]: result for result in results}
+
+
+class LatencyCache:
+    """Probe results per base URL, reused until they are older than the TTL"""
+
+    def __init__(self, ttl=PROBE_TTL):
+        self.ttl = ttl
+        # url -> (monotonic timestamp, result)
+        self._results = {}
+        self._guard = threading.Lock()
+
+    def get(self, url):
+        with self._guard:
+            cached = self._results.get(url)
+        if cached is None or time.monotonic() - cached[0] > self.ttl:
+            return None
+        return cached[1]
+
+    def stale(self, urls):
+        return [url for url in dict.fromkeys(urls) if self.get(url) is None]
+
+    def probe(self, urls, concurrency=PROBE_CONCURRENCY, timeout=PROBE_TIMEOUT):
+        """Probe the URLs without a fresh result (blocking) and return results for all of them"""
+        stale = self.stale(urls)
+        if stale:
+            results = asyncio.run(probe_endpoints(stale, concurrency, timeout))
+            now = time.monotonic()
+            with self._guard:
+                for url, result in results.items():
+                    self._results[url] = (now, result)
+        return {url: self.get(url) for url in urls}
+
+
+# Bulk profile archives: profiles plus a manifest of their sha256 hashes
+ARCHIVE_MANIFEST = "manifest.json"
+ARCHIVE_CHUNK_SIZE = 64 * 1024
+# Archive entries larger than this are rejected rather than unpacked
+ARCHIVE_MAX_ENTRY_SIZE = 16 * 1024 * 1024
+
+
+def export_profiles(archive_path, profile_files):
+    """Stream profile files into one compressed zip with a sha256 manifest; returns the number exported"""
+    manifest = {}
+    with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        for path in profile_files:
+            if path.name in manifest:
+                continue
+            digest = hashlib.sha256()
+            with open(path, 'rb') as src, zf.open(path.name, 'w') as dest:
+                while chunk := src.read(ARCHIVE_CHUNK_SIZE):
+                    digest.update(chunk)
+                    dest.write(chunk)
+            manifest[path.name] = digest.hexdigest()
+        zf.writestr(ARCHIVE_MANIFEST, json.dumps({"version": 1, "files": manifest}, indent=2))
+    return len(manifest)
+
+
+def unique_profile_path(directory, name):
+    """A path for name in directory that doesn't overwrite an existing file: foo_settings-1.json, ..."""
+    path = directory / name
+    suffix = TEMPLATE_SUFFIX if is_template_file(path) else ".json"
+    base = name[:-len(suffix)]
+    counter = 1
+    while path.exists():
+        path = directory / f"{base}-{counter}{suffix}"
+        counter += 1
+    return path
+
+
+def import_profiles(archive_path, target_dir, known_hashes):
+    """Unpack an export_profiles archive into target_dir; returns (imported file names, skipped count)"""
+    # Entries are streamed to temp files and verified against the manifest, content already
+    # present locally is skipped, and everything else is moved into place in one locked batch
+    known_hashes = set(known_hashes)
+    staged = []
+    skipped = 0
+    try:
+        with zipfile.ZipFile(archive_path) as zf:
+            manifest = json.loads(zf.read(ARCHIVE_MANIFEST).decode('utf-8'))["files"]
+            for info in zf.infolist():
+                name = info.filename
+                expected = manifest.get(name)
+                # Only plain profile names listed in the manifest; never the active settings.json
+                if (expected is None or Path(name).name != name or name == "settings.json"
+                        or not is_settings_file_name(name)):
+                    continue
+                if expected in known_hashes:
+                    skipped += 1
+                    continue
+                if info.file_size > ARCHIVE_MAX_ENTRY_SIZE:
+                    raise ValueError(f"{name} is too large")
+
+                fd, tmp_name = tempfile.mkstemp(dir=target_dir, prefix=f".{name}.", suffix=".tmp")
+                staged.append((tmp_name, name))
+                digest = hashlib.sha256()
+                written = 0
+                with os.fdopen(fd, 'wb') as dest, zf.open(info) as src:
+                    while chunk := src.read(ARCHIVE_CHUNK_SIZE):
+                        written += len(chunk)
+                        if written > ARCHIVE_MAX_ENTRY_SIZE:
+                            raise ValueError(f"{name} is too large")
+                        digest.update(chunk)
+                        dest.write(chunk)
+                if digest.hexdigest() != expected:
+                    raise ValueError(f"Checksum mismatch: {name}")
+                known_hashes.add(expected)
+
+        imported = []
+        with state_lock(target_dir):
+            for tmp_name, name in staged:
+                final_path = unique_profile_path(target_dir, name)
+                os.replace(tmp_name, final_path)
+                imported.append(final_path.name)
+        staged = []
+        return imported, skipped
+    finally:
+        for tmp_name, _ in staged:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
+# Highlight tags for the JSON preview; spans are stored as flat [tag id, start, end, ...] lists
+HIGHLIGHT_TAGS = ("string", "number", "boolean", "null", "key", "brace", "bracket", "colon", "comma")
+TAG_IDS = {tag: i for i, tag in enumerate(HIGHLIGHT_TAGS)}
+
+
+def compute_json_spans(content):
+    """Lex formatted JSON into a flat [tag id, start offset, end offset, ...] highlight span list"""
+    spans = []
+
+    # Keep track of string positions to avoid re-highlighting them
+    string_ranges = []
+    
+    # First pass: Highlight strings (including keys and values)
+    for match in re.finditer(r'"([^"\\\\]|\\\\.)*"', content):
+        string_ranges.append((match.start(), match.end()))
+        
+        # Check if this string is a key (followed by colon)
+        rest_content = content[match.end():].lstrip()
+        if rest_content.startswith(':'):
+            spans += (TAG_IDS["key"], match.start(), match.end())
+        else:
+            spans += (TAG_IDS["string"], match.start(), match.end())
+    
+    # Helper function to check if position is inside a string
+    def is_in_string(pos):
+        for start, end in string_ranges:
+            if start <= pos < end:
+                return True
+        return False
+    
+    # Highlight numbers (only outside strings)
+    for match in re.finditer(r'-?\d+\.?\d*([eE][+-]?\d+)?', content):
+        if not is_in_string(match.start()):
+            spans += (TAG_IDS["number"], match.start(), match.end())
+    
+    # Highlight booleans and null (only outside strings)
+    for match in re.finditer(r'\b(true|false|null)\b', content):
+        if not is_in_string(match.start()):
+            if match.group(1) in ['true', 'false']:
+                spans += (TAG_IDS["boolean"], match.start(), match.end())
+            else:
+                spans += (TAG_IDS["null"], match.start(), match.end())
+    
+    # Highlight braces and brackets (only outside strings)
+    for match in re.finditer(r'[{}]', content):
+        if not is_in_string(match.start()):
+            spans += (TAG_IDS["brace"], match.start(), match.end())
+        
+    for match in re.finditer(r'[\[\]]', content):
+        if not is_in_string(match.start()):
+            spans += (TAG_IDS["bracket"], match.start(), match.end())
+    
+    # Highlight colons and commas (only outside strings)
+    for match in re.finditer(r':', content):
+        if not is_in_string(match.start()):
+            spans += (TAG_IDS["colon"], match.start(), match.end())
+        
+    for match in re.finditer(r',', content):
+        if not is_in_string(match.start()):
+            spans += (TAG_IDS["comma"], match.start(), match.end())
+
+    return spans
+
+
+# Formatted previews are cached on disk per content hash; oldest entries go first past the size cap
+PREVIEW_CACHE_MAX_BYTES = 8 * 1024 * 1024
+# Bump when formatting or span encoding changes so old entries are ignored
+PREVIEW_CACHE_VERSION = 1
+
+
+class PreviewCache:
+    """Bounded on-disk cache of formatted preview text and highlight spans, keyed by content hash"""
+
+    def __init__(self, directory, max_bytes=PREVIEW_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def get(self, content_hash):
+        """Return (formatted text, spans) for a content hash, or None on a miss"""
+        path = self.directory / f"{content_hash}.json"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get("version") != PREVIEW_CACHE_VERSION:
+                return None
+            text, spans = entry["text"], entry["spans"]
+            if not self._valid(text, spans):
+                raise ValueError("Malformed preview cache entry")
+            # Touch the entry so eviction drops the least recently used ones
+            os.utime(path)
+            return text, spans
+        except IOError:
+            return None
+        except (ValueError, KeyError, AttributeError):
+            # Truncated or edited: drop it so the preview is rebuilt and re-cached
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+
+    @staticmethod
+    def _valid(text, spans):
+        """Check an entry has the shape insert_json_with_highlighting relies on"""
+        if not isinstance(text, str) or not isinstance(spans, list) or len(spans) % 3:
+            return False
+        if not all(type(value) is int for value in spans):
+            return False
+        return all(0 <= spans[i] < len(HIGHLIGHT_TAGS) and 0 <= spans[i + 1] <= spans[i + 2] <= len(text)
+                   for i in range(0, len(spans), 3))
+
+    def put(self, content_hash, text, spans):
+        try:
+            self.directory.mkdir(exist_ok=True)
+            entry = {"version": PREVIEW_CACHE_VERSION, "text": text, "spans": spans}
+            atomic_write_text(self.directory / f"{content_hash}.json",
+                              json.dumps(entry, ensure_ascii=False, separators=(',', ':')))
+            self.evict()
+        except (OSError, UnicodeError):
+            # The cache is only an optimization; text with lone surrogates can't be encoded as UTF-8
+            pass
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".json"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+
+def flatten_json(data, prefix=""):
+    """Yield (key_path, value) pairs for every leaf of a JSON document"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from flatten_json(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            yield from flatten_json(value, f"{prefix}[{i}]")
+    else:
+        yield prefix, data
+
+
+class MappedLineReader:
+    """Read a large file a chunk of lines at a time through a read-only memory map"""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            self._file.close()
+            raise
+        self.offset = 0
+
+    @property
+    def exhausted(self):
+        return self.offset >= len(self._map)
+
+    def read_lines(self, count=PREVIEW_CHUNK_LINES, max_bytes=PREVIEW_CHUNK_BYTES):
+        """Return the next count lines as text, never decoding more than max_bytes at once"""
+        size = len(self._map)
+        limit = min(size, self.offset + max_bytes)
+        end = self.offset
+        for _ in range(count):
+            newline = self._map.find(b"\n", end, limit)
+            if newline == -1:
+                end = limit
+                break
+            end = newline + 1
+
+        # Don't split a multi-byte UTF-8 sequence at the chunk boundary
+        while self.offset < end < size and (self._map[end] & 0xC0) == 0x80:
+            end -= 1
+
+        chunk = self._map[self.offset:end]
+        self.offset = end
+        return chunk.decode('utf-8', errors='replace')
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def is_settings_file_name(file_name):
+    """Filter to only include settings-related JSON files"""
+    file_name = file_name.lower()
+    return file_name.endswith(".json") and (
+        file_name == "settings.json" or
+        "settings" in file_name or
+        file_name.startswith("settings_") or
+        file_name.endswith("_settings.json"))
+
+
+class ProfileSource:
+    """A location profiles are scanned from: a plain directory or a root of project repositories"""
+
+    def __init__(self, path, kind="dir"):
+        self.path = Path(path).expanduser()
+        # "dir" scans path itself; "project" scans path/.claude and <repo>/.claude for each repo under path
+        self.kind = kind
+        # Directory mtimes from the last listing; the listing is reused while they are unchanged
+        self._signature = None
+        self._files = []
+
+    def _profile_dirs(self):
+        if self.kind != "project":
+            return [self.path]
+        dirs = [self.path / ".claude"]
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    if entry.is_dir() and not entry.name.startswith("."):
+                        dirs.append(Path(entry.path) / ".claude")
+        except OSError:
+            pass
+        return dirs
+
+    def scan(self):
+        """Return the profile files of this source, listing directories only if they changed"""
+        signature = []
+        for directory in self._profile_dirs():
+            try:
+                signature.append((directory, directory.stat().st_mtime_ns))
+            except OSError:
+                continue
+        if signature == self._signature:
+            return self._files
+
+        files = []
+        for directory, _ in signature:
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_file() and is_settings_file_name(entry.name):
+                            files.append(Path(entry.path))
+            except OSError:
+                continue
+
+        self._signature = signature
+        self._files = files
+        return files
+
+
+class ProfileIndex:
+    """Incremental search index over profile file names and flattened JSON contents"""
+
+    def __init__(self, label=None):
+        # Searchable name of a profile; the full path would make every query for a path part match everything
+        self.label = label or (lambda profile: profile_file(profile).name)
+        # path -> {"stat": (mtime_ns, size), "hash": sha256 hex, "data": parsed JSON or None,
+        #          "haystack": lowercase text, "validation": (level, message),
+        #          "variant_validation": {variant: (level, message)} and
+        #          "variant_haystacks": {variant: lowercase text} for templates}
+        self.entries = {}
+        # (sha256 hex, is template) -> ((level, message), variant results), so identical content is
+        # validated only once; the same bytes validate differently as a template and as plain settings
+        self.validation_cache = {}
+
+    def sync(self, paths):
+        """Bring the index in line with a scan result, re-reading only files whose stat changed"""
+        paths = set(paths)
+        for path in list(self.entries):
+            if path not in paths:
+                self.discard(path)
+
+        stale = []
+        for path in paths:
+            try:
+                st = path.stat()
+            except OSError:
+                self.discard(path)
+                continue
+            stat_key = (st.st_mtime_ns, st.st_size)
+            entry = self.entries.get(path)
+            if entry is None or entry["stat"] != stat_key:
+                stale.append((path, stat_key))
+
+        # Reading, hashing, parsing and validating changed files is spread across a worker pool
+        if len(stale) > 1:
+            with ThreadPoolExecutor() as pool:
+                loaded = list(pool.map(lambda item: self._load(*item), stale))
+        else:
+            loaded = [self._load(*item) for item in stale]
+
+        for (path, _), entry in zip(stale, loaded):
+            self.entries[path] = entry
+            if entry["hash"] is not None:
+                self.validation_cache.setdefault((entry["hash"], is_template_file(path)),
+                                                 (entry["validation"], entry["variant_validation"]))
+
+    def _haystack(self, profile, data):
+        """Lowercase search text of a profile: its label plus every key path=value of its settings"""
+        lines = [self.label(profile)]
+        if data is not None:
+            lines.extend(f"{key}={value}" for key, value in flatten_json(data))
+        return "\n".join(lines).lower()
+
+    def _load(self, path, stat_key):
+        data = None
+        content_hash = None
+        validation = ("ok", "")
+        variant_validation = {}
+        # Oversized files are indexed by name only to keep memory bounded
+        if stat_key[1] > PREVIEW_SIZE_LIMIT:
+            validation = ("warning", "Not validated: file too large")
+        else:
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                content_hash = hashlib.sha256(raw).hexdigest()
+                data = json.loads(raw.decode('utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                data = None
+                validation = ("error", f"Invalid JSON: {e}")
+            except IOError:
+                data = None
+                validation = ("error", "File not readable")
+            else:
+                cached = self.validation_cache.get((content_hash, is_template_file(path)))
+                if cached is not None:
+                    validation, variant_validation = cached
+                elif is_template_file(path):
+                    validation, variant_validation = validate_template(data, content_hash)
+                else:
+                    validation = validate_settings(data)
+
+        # Each expanded variant is searched by its own label and rendered values, not the raw template
+        variant_haystacks = {
+            variant: self._haystack(TemplateProfile(path, variant), render_template(data, content_hash, variant)[1])
+            for variant in variant_validation
+        }
+        return {
+            "stat": stat_key,
+            "hash": content_hash,
+            "data": data,
+            "haystack": self._haystack(path, data),
+            "validation": validation,
+            "variant_validation": variant_validation,
+            "variant_haystacks": variant_haystacks
+        }
+
+    def discard(self, path):
+        self.entries.pop(path, None)
+
+    def data(self, path):
+        """Return the parsed JSON of an indexed file, or None if unreadable"""
+        entry = self.entries.get(path)
+        return entry["data"] if entry else None
+
+    def content_hash(self, path, stat_key=None):
+        """Return the indexed sha256 of a file; given a stat_key, only if the file is unchanged since indexing"""
+        entry = self.entries.get(path)
+        if entry is None or (stat_key is not None and entry["stat"] != stat_key):
+            return None
+        return entry["hash"]
+
+    def validation(self, path, variant=None):
+        """Return the (level, message) validation result of an indexed file, or of one template variant"""
+        entry = self.entries.get(path)
+        if not entry:
+            return ("ok", "")
+        if variant is not None:
+            return entry["variant_validation"].get(variant, entry["validation"])
+        return entry["validation"]
+
+    def matches(self, profile, query):
+        """Check whether every whitespace-separated term of query occurs in the profile's index text"""
+        terms = query.lower().split()
+        if not terms:
+            return True
+        entry = self.entries.get(profile_file(profile))
+        if entry is None:
+            return False
+        haystack = entry["haystack"]
+        if isinstance(profile, TemplateProfile):
+            haystack = entry["variant_haystacks"].get(profile.variant, haystack)
+        return all(term in haystack for term in terms)
+
+
+class ProfileLibrary:
+    """Profile discovery, naming and switching, shared by the window and resident mode"""
+
+    def __init__(self, claude_dir=CLAUDE_DIR, source_specs=()):
+        self.claude_dir = claude_dir
+        self.settings_file = claude_dir / "settings.json"
+        self.index = ProfileIndex(label=self.profile_label)
+        # ~/.claude first, then any sources configured in app state
+        self.sources = [ProfileSource(claude_dir)]
+        for item in source_specs:
+            try:
+                self.sources.append(ProfileSource(item['path'], item.get('type', 'dir')))
+            except (KeyError, TypeError, AttributeError):
+                continue
+        self.profiles = []
+
+    def scan(self):
+        """Rescan all sources and return the ordered profile list, with templates expanded to variants"""
+        # Scan all profile sources concurrently; each one re-lists only directories that changed
+        with ThreadPoolExecutor() as pool:
+            scanned = list(pool.map(lambda source: source.scan(), self.sources))
+
+        # Merge into one list, dropping files reachable from more than one source
+        seen = set()
+        settings_file_path = None
+        other_files = []
+        for files in scanned:
+            for file_path in files:
+                real_path = os.path.realpath(file_path)
+                if real_path in seen:
+                    continue
+                seen.add(real_path)
+                if file_path == self.settings_file:
+                    settings_file_path = file_path
+                else:
+                    other_files.append(file_path)
+
+        # Sort with settings.json on top, then ~/.claude files, then other sources
+        other_files.sort(key=lambda path: (path.parent != self.claude_dir, self.profile_label(path).lower()))
+
+        config_files = [settings_file_path] if settings_file_path else []
+        config_files.extend(other_files)
+
+        # Update the search index incrementally; unchanged files are not re-read
+        self.index.sync(config_files)
+        self.profiles = self.expand_templates(config_files)
+        return list(self.profiles)
+
+    def expand_templates(self, config_files):
+        """Replace each valid template file with one profile per variant"""
+        expanded = []
+        for config_file in config_files:
+            template_doc = self.index.data(config_file)
+            level, _ = self.index.validation(config_file)
+            if is_template_file(config_file) and template_doc is not None and level != "error":
+                expanded.extend(TemplateProfile(config_file, variant) for variant in template_doc["variants"])
+            else:
+                expanded.append(config_file)
+        return expanded
+
+    def profile_key(self, config_file):
+        """Stable identity saved in app state: bare name for ~/.claude files, full path otherwise"""
+        if isinstance(config_file, TemplateProfile):
+            return f"{self.profile_key(config_file.path)}#{config_file.variant}"
+        if config_file.parent == self.claude_dir:
+            return config_file.name
+        return str(config_file)
+
+    def profile_label(self, config_file):
+        """Name shown on a card; files outside ~/.claude are prefixed with their project or folder"""
+        if isinstance(config_file, TemplateProfile):
+            label = self.profile_label(config_file.path)
+            return f"{label[:-len(TEMPLATE_SUFFIX)]}:{config_file.variant}"
+        if config_file.parent == self.claude_dir:
+            return config_file.name
+        owner = config_file.parent
+        if owner.name == ".claude":
+            owner = owner.parent
+        return f"{owner.name}/{config_file.name}"
+
+    def find_profile(self, name):
+        """Look a profile up by saved key or card label, with or without the .json suffix"""
+        for config_file in self.profiles:
+            for candidate in (self.profile_key(config_file), self.profile_label(config_file)):
+                if name in (candidate, candidate.removesuffix(".json")):
+                    return config_file
+        return None
+
+    def next_profile(self, current_key=None):
+        """The profile after current_key in list order, skipping settings.json itself"""
+        candidates = [profile for profile in self.profiles if profile != self.settings_file]
+        if not candidates:
+            return None
+        keys = [self.profile_key(profile) for profile in candidates]
+        position = keys.index(current_key) + 1 if current_key in keys else 0
+        return candidates[position % len(candidates)]
+
+    def render_profile(self, template_profile):
+        """Render a template variant to (settings text, settings data) using the indexed template"""
+        path = template_profile.path
+        return render_template(self.index.data(path), self.index.content_hash(path), template_profile.variant)
+
+    def validation(self, config_file):
+        """The (level, message) shown for a profile; template variants report their own result"""
+        if isinstance(config_file, TemplateProfile):
+            return self.index.validation(config_file.path, config_file.variant)
+        return self.index.validation(config_file)
+
+    def profile_base_url(self, config_file):
+        """The API endpoint a profile talks to, or None if the profile can't be read"""
+        try:
+            if isinstance(config_file, TemplateProfile):
+                _, data = self.render_profile(config_file)
+            else:
+                data = self.index.data(config_file)
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        env = data.get("env")
+        base_url = env.get("ANTHROPIC_BASE_URL") if isinstance(env, dict) else None
+        return base_url if isinstance(base_url, str) and base_url else DEFAULT_BASE_URL
+
+    def activate(self, profile, record=True):
+        """Make profile the active settings.json with a single locked, atomic write
+
+        With record, active_profile in .cc-cache is updated under the same lock; resident mode
+        passes False and records it later, off the switch path.
+        """
+        active_key = self.profile_key(profile)
+        with state_lock(self.claude_dir):
+            if isinstance(profile, TemplateProfile):
+                # Rendered output is memoized, so switching to a variant needs no parsing
+                settings_text, _ = self.render_profile(profile)
+                atomic_write_text(self.settings_file, settings_text)
+            else:
+                atomic_copy(profile, self.settings_file)
+            if record:
+                # Record what was switched to, separately from the card last clicked in the window
+                _update_json_file_locked(self.claude_dir / ".cc-cache",
+                                         lambda state: state.update(active_profile=active_key))
+
+
+def read_app_state(app_state_file):
+    """Load the last selected file, theme, extra profile sources and hotkey from the app state file"""
+    try:
+        if app_state_file.exists():
+            with open(app_state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+                return {
+                    'last_selected_file': state.get('last_selected_file'),
+                    'active_profile': state.get('active_profile'),
+                    'theme_mode': state.get('theme_mode', 'dark'),
+                    'profile_sources': state.get('profile_sources', []),
+                    'hotkey': state.get('hotkey', DEFAULT_HOTKEY)
+                }
+    except (json.JSONDecodeError, IOError, AttributeError):
+        pass
+    return {'last_selected_file': None, 'active_profile': None, 'theme_mode': 'dark', 'profile_sources': [],
+            'hotkey': DEFAULT_HOTKEY}
+
+
+def instance_address(claude_dir=CLAUDE_DIR):
+    """Address and family of the single-instance endpoint: a per-user named pipe on Windows, a socket elsewhere"""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\cc-switcher-{getpass.getuser()}", "AF_PIPE"
+    return str(claude_dir / ".cc-switcher.sock"), "AF_UNIX"
+
+
+def instance_authkey(claude_dir=CLAUDE_DIR):
+    """Per-user random secret for the IPC handshake, kept in a 0600 file under ~/.claude"""
+    key_file = claude_dir / ".cc-switcher.key"
+    claude_dir.mkdir(exist_ok=True)
+    try:
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another launch may still be writing the key
+        for _ in range(50):
+            key = key_file.read_bytes()
+            if len(key) == IPC_KEY_SIZE:
+                return key
+            time.sleep(0.01)
+        # Still the wrong size, e.g. truncated by a crash: replace it (mkstemp files are already 0600)
+        def fill(tmp_name):
+            with open(tmp_name, 'wb') as f:
+                f.write(os.urandom(IPC_KEY_SIZE))
+                f.flush()
+                os.fsync(f.fileno())
+        _atomic_replace(key_file, fill)
+        # A concurrent launch may have replaced it too; whichever rename landed last is the key
+        key = key_file.read_bytes()
+        if len(key) != IPC_KEY_SIZE:
+            raise OSError(f"Invalid IPC key file: {key_file}")
+        return key
+    key = os.urandom(IPC_KEY_SIZE)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+
+def send_json(conn, obj):
+    conn.send_bytes(json.dumps(obj).encode('utf-8'))
+
+
+def recv_json(conn):
+    """Receive one JSON message; raw bytes are decoded as JSON, never unpickled"""
+    return json.loads(conn.recv_bytes(IPC_MAX_MESSAGE).decode('utf-8'))
+
+
+def forward_command(command, claude_dir=CLAUDE_DIR, timeout=IPC_TIMEOUT):
+    """Hand a command to the running instance; returns False if none answers within timeout"""
+    address, family = instance_address(claude_dir)
+    accepted = []
+
+    def attempt():
+        try:
+            authkey = instance_authkey(claude_dir)
+            with Client(address, family) as conn:
+                answer_challenge(conn, authkey)
+                deliver_challenge(conn, authkey)
+                send_json(conn, command)
+                if conn.poll(timeout):
+                    accepted.append(recv_json(conn) == "ok")
+        except (OSError, EOFError, ValueError, AuthenticationError):
+            pass
+
+    # Connect and handshake have no timeouts of their own, so bound the whole exchange
+    worker = threading.Thread(target=attempt, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    return bool(accepted and accepted[0])
+
+
+class InstanceServer:
+    """Receives commands from later launches over a local socket or named pipe and queues them"""
+
+    def __init__(self, claude_dir=CLAUDE_DIR):
+        self.commands = queue.Queue()
+        self._authkey = instance_authkey(claude_dir)
+        address, family = instance_address(claude_dir)
+        if family == "AF_UNIX":
+            # Only the holder of the instance lock gets here, so a socket file left behind is stale
+            if os.path.exists(address):
+                os.unlink(address)
+        # The handshake runs per connection in _handle, so accept() itself never waits on a peer
+        self._listener = Listener(address, family)
+        self._address = (address, family)
+        self._closed = False
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        failures = 0
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                if self._closed:
+                    break
+                # Persistent errors such as EMFILE would otherwise spin; back off up to a second
+                failures += 1
+                time.sleep(min(0.01 * 2 ** failures, 1.0))
+                continue
+            failures = 0
+            if self._closed:
+                conn.close()
+                break
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        """Authenticate one connection and queue its command; a stalled peer only blocks this thread"""
+        with conn:
+            try:
+                deliver_challenge(conn, self._authkey)
+                answer_challenge(conn, self._authkey)
+                if not conn.poll(IPC_TIMEOUT):
+                    return
+                command = recv_json(conn)
+                valid = (isinstance(command, list) and bool(command)
+                         and all(isinstance(part, str) for part in command))
+                if valid:
+                    self.commands.put(command)
+                send_json(conn, "ok" if valid else "error")
+            except (OSError, EOFError, ValueError, AuthenticationError):
+                pass
+
+    def close(self):
+        """Stop serving; a throwaway connection wakes accept(), since closing the listener may not"""
+        self._closed = True
+        try:
+            Client(*self._address).close()
+        except OSError:
+            pass
+        self._thread.join(IPC_TIMEOUT)
+        self._listener.close()
+
 
 class ClaudeConfigSwitcher:
-    def __init__(self):
+    def __init__(self, command_queue=None, library=None):
+        load_gui()
         self.root = ctk.CTk()
         # Configure window properties
         self.root.configure(fg_color=COLORS["bg_primary"])
@@ -71,12 +1340,17 @@ class ClaudeConfigSwitcher:
         center_y = int((screen_height - window_height) // 2)
         self.root.geometry(f'{window_width}x{window_height}+{center_x}+{center_y}')
 
-        self.claude_dir = Path.home() / ".claude"
+        self.claude_dir = CLAUDE_DIR
         self.settings_file = self.claude_dir / "settings.json"
         self.app_state_file = self.claude_dir / ".cc-cache"
+        # Resident mode passes its warm library so opening the window doesn't rescan from scratch
+        self.library = library or ProfileLibrary(self.claude_dir, self.load_app_state()['profile_sources'])
 
         self.config_files = []
         self.current_config = None
+        self.latency_cache = LatencyCache()
+        self.preview_cache = PreviewCache(self.claude_dir / ".cc-preview-cache")
+        self.probe_thread = None
 
         # Initialize theme from saved state
         self.init_theme()
@@ -90,6 +1364,25 @@ class ClaudeConfigSwitcher:
         
         # Use after_idle to ensure UI is ready before refreshing
         self.root.after_idle(lambda: self.refresh_config_list(is_initial=True))
+        self.root.after_idle(self.finish_startup)
+
+        # Commands forwarded by later launches (and this launch's own command line)
+        self.command_queue = command_queue
+        if self.command_queue is not None:
+            self.root.after(100, self.poll_commands)
+
+    def finish_startup(self):
+        """Close the packaged build's splash screen once the window is ready"""
+        try:
+            import pyi_splash  # only present in PyInstaller builds made with --splash
+            pyi_splash.close()
+        except ImportError:
+            pass
+
+        # build_exe.py sets this to time cold starts: quit as soon as the first frame is up
+        if os.environ.get("CC_SWITCHER_STARTUP_PROBE"):
+            self.root.update()
+            self.root.destroy()
 
     def init_theme(self):
         """Initialize theme from saved state"""
@@ -105,41 +1398,22 @@ class ClaudeConfigSwitcher:
             COLORS = DARK_COLORS
 
     def load_app_state(self):
-        """Load the last selected file and theme from app state"""
-        try:
-            if self.app_state_file.exists():
-                with open(self.app_state_file, 'r', encoding='utf-8') as f:
-                    state = json.load(f)
-                    return {
-                        'last_selected_file': state.get('last_selected_file'),
-                        'theme_mode': state.get('theme_mode', 'dark')
-                    }
-        except (json.JSONDecodeError, IOError):
-            pass
-        return {'last_selected_file': None, 'theme_mode': 'dark'}
+        """Load the last selected file, theme and extra profile sources from app state"""
+        return read_app_state(self.app_state_file)
 
     def save_app_state(self, selected_file_name=None, theme_mode=None):
         """Save the current selected file and theme to app state"""
-        try:
-            self.claude_dir.mkdir(exist_ok=True)
-            
-            # Load existing state
-            state = {'last_selected_file': None, 'theme_mode': 'dark'}
-            if self.app_state_file.exists():
-                try:
-                    with open(self.app_state_file, 'r', encoding='utf-8') as f:
-                        state = json.load(f)
-                except (json.JSONDecodeError, IOError):
-                    pass
-            
+        def apply(state):
             # Update with new values if provided
             if selected_file_name is not None:
                 state['last_selected_file'] = selected_file_name
             if theme_mode is not None:
                 state['theme_mode'] = theme_mode
-                
-            with open(self.app_state_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, indent=2)
+
+        try:
+            self.claude_dir.mkdir(exist_ok=True)
+            # Other instances and scripts may update the state concurrently
+            update_json_file(self.app_state_file, apply, state_lock(self.claude_dir))
         except (IOError, OSError):
             pass  # Silently ignore save failures
 
@@ -177,6 +1451,53 @@ class ClaudeConfigSwitcher:
         )
         self.sync_btn.pack(pady=(0, 8))
 
+        # Switch to the profile with the fastest healthy endpoint (lightning icon)
+        self.fastest_btn = ctk.CTkButton(
+            top_container,
+            text="⚡",
+            command=self.switch_to_fastest,
+            width=26,
+            height=26,
+            corner_radius=0,
+            fg_color="transparent",
+            hover_color=COLORS["card_hover"],
+            text_color=COLORS["text_primary"],
+            font=ctk.CTkFont(family="Segoe UI", size=14),
+            border_width=0
+        )
+        self.fastest_btn.pack(pady=(0, 8))
+
+        # Bulk export/import of the profile set as one archive
+        self.export_btn = ctk.CTkButton(
+            top_container,
+            text="⇧",
+            command=self.export_profiles,
+            width=26,
+            height=26,
+            corner_radius=0,
+            fg_color="transparent",
+            hover_color=COLORS["card_hover"],
+            text_color=COLORS["text_primary"],
+            font=ctk.CTkFont(family="Segoe UI", size=14),
+            border_width=0
+        )
+        self.export_btn.pack(pady=(0, 8))
+
+        self.import_btn = ctk.CTkButton(
+            top_container,
+            text="⇩",
+            command=self.import_profiles,
+            width=26,
+            height=26,
+            corner_radius=0,
+            fg_color="transparent",
+            hover_color=COLORS["card_hover"],
+            text_color=COLORS["text_primary"],
+            font=ctk.CTkFont(family="Segoe UI", size=14),
+            border_width=0
+        )
+        self.import_btn.pack(pady=(0, 8))
+
         # Bottom button container to push buttons to bottom
         button_container = ctk.CTkFrame(toolbar_container, fg_color="transparent")
         button_container.pack(side="bottom")
@@ -283,6 +1604,22 @@ class ClaudeConfigSwitcher:
         )
         self.open_dir_btn.pack(side="right", fill="x", expand=True, padx=(2, 0))
 
+        # --- Search Box ---
+        self.search_entry = ctk.CTkEntry(
+            self.left_panel,
+            placeholder_text="Search profiles...",
+            height=28,
+            corner_radius=0,
+            fg_color=COLORS["bg_tertiary"],
+            text_color=COLORS["text_primary"],
+            placeholder_text_color=COLORS["text_muted"],
+            font=ctk.CTkFont(family="Segoe UI", size=13),
+            border_width=1,
+            border_color=COLORS["border"]
+        )
+        self.search_entry.pack(side="top", fill="x", padx=8, pady=(8, 0))
+        self.search_entry.bind("<KeyRelease>", lambda e: self.apply_search_filter())
+
         # --- Config List (takes all remaining space) ---
         list_container = ctk.CTkFrame(self.left_panel, fg_color="transparent")
         list_container.pack(fill="both", expand=True, padx=8, pady=8)
@@ -315,6 +1652,22 @@ class ClaudeConfigSwitcher:
         )
         self.preview_textbox.pack(fill="both", expand=True)
 
+        # Shown below the preview only while a large file has unread lines
+        self.load_more_btn = ctk.CTkButton(
+            preview_container,
+            text="Load more",
+            command=self.load_more_preview,
+            height=26,
+            corner_radius=0,
+            fg_color=COLORS["bg_tertiary"],
+            hover_color=COLORS["card_hover"],
+            text_color=COLORS["text_primary"],
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            border_width=1,
+            border_color=COLORS["border"]
+        )
+        self.preview_reader = None
+
         self.selected_config = None
 
     def create_config_button(self, config_file, settings_content):
@@ -337,7 +1690,7 @@ class ClaudeConfigSwitcher:
         # File name with compact typography
         name_label = ctk.CTkLabel(
             content_frame,
-            text=config_file.name,
+            text=self.library.profile_label(config_file),
             font=ctk.CTkFont(family="Segoe UI", size=13),
             anchor="w",
             text_color=COLORS["text_primary"]
@@ -345,17 +1698,16 @@ class ClaudeConfigSwitcher:
         name_label.pack(side="left", fill="x", expand=True, anchor="w")
 
         # Status indicator with modern styling
-        is_active = config_file.name == "settings.json"
+        is_active = config_file == self.settings_file
         is_synced = False
 
         if not is_active and settings_content is not None:
-            try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    current_content = json.load(f)
-                if current_content == settings_content:
-                    is_synced = True
-            except (json.JSONDecodeError, IOError):
-                pass
+            if isinstance(config_file, TemplateProfile):
+                _, current_content = self.library.render_profile(config_file)
+            else:
+                current_content = self.library.index.data(config_file)
+            if current_content is not None and current_content == settings_content:
+                is_synced = True
 
         if is_active:
             status_label = ctk.CTkLabel(
@@ -374,9 +1726,31 @@ class ClaudeConfigSwitcher:
             )
             status_label.pack(side="right", padx=(6, 0))
 
+        # Validation badge for profiles with schema problems
+        level, _ = self.library.validation(config_file)
+        badge_label = None
+        if level != "ok":
+            badge_label = ctk.CTkLabel(
+                content_frame,
+                text="✕" if level == "error" else "!",
+                font=ctk.CTkFont(family="Segoe UI", size=13, weight="bold"),
+                text_color=COLORS["accent_red"] if level == "error" else COLORS["warning_orange"]
+            )
+            badge_label.pack(side="right", padx=(6, 0))
+
+        # Endpoint latency badge, filled in when a probe result is available
+        latency_label = ctk.CTkLabel(
+            content_frame,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=11),
+            text_color=COLORS["text_muted"]
+        )
+
         # Add hover effect data
         card._config_file = config_file
         card._is_selected = False
+        card._latency_label = latency_label
+        self.update_latency_badge(card)
         
         # Bind click and hover events to all components
         def on_click(e):
@@ -394,6 +1768,9 @@ class ClaudeConfigSwitcher:
         widgets_to_bind = [card, content_frame, name_label]
         if 'status_label' in locals():
             widgets_to_bind.append(status_label)
+        if badge_label is not None:
+            widgets_to_bind.append(badge_label)
+        widgets_to_bind.append(latency_label)
             
         for widget in widgets_to_bind:
             widget.bind("<Button-1>", on_click)
@@ -404,12 +1781,12 @@ class ClaudeConfigSwitcher:
         self.selected_config = config_file
         
         # Save the selected file to app state
-        self.save_app_state(selected_file_name=config_file.name)
+        self.save_app_state(selected_file_name=self.library.profile_key(config_file))
 
         # Update UI selection highlight
         for child in self.config_listbox.winfo_children():
             if hasattr(child, '_config_file'):
-                if child._config_file.name == config_file.name:
+                if child._config_file == config_file:
                     # Selected card - no border for clean look
                     child.configure(fg_color=COLORS["accent_primary"], border_width=0)
                     child._is_selected = True
@@ -432,108 +1809,107 @@ class ClaudeConfigSwitcher:
 
         self.update_preview(config_file)
 
+        level, message = self.library.validation(config_file)
+        if level != "ok":
+            self.update_status(message, COLORS["accent_red"] if level == "error" else COLORS["warning_orange"])
+
     def update_preview(self, config_file):
         try:
+            self.close_preview_reader()
             self.preview_textbox.delete("1.0", "end")
 
-            if config_file.exists():
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+            if isinstance(config_file, TemplateProfile):
+                formatted_content, _ = self.library.render_profile(config_file)
+                content_hash = hashlib.sha256(formatted_content.encode('utf-8')).hexdigest()
+                cached = self.preview_cache.get(content_hash)
+                if cached is not None:
+                    self.insert_json_with_highlighting(*cached)
+                else:
+                    spans = compute_json_spans(formatted_content)
+                    self.insert_json_with_highlighting(formatted_content, spans)
+                    self.preview_cache.put(content_hash, formatted_content, spans)
+            elif config_file.exists():
+                st = config_file.stat()
+                if st.st_size > PREVIEW_SIZE_LIMIT:
+                    # Large file: page through it raw instead of parsing and re-formatting
+                    self.preview_reader = MappedLineReader(config_file)
+                    self.load_more_preview()
+                    self.update_status("Large file: showing raw text", COLORS["warning_orange"])
+                    return
+
+                # The index already hashed the file if it is unchanged since the last scan
+                raw = None
+                content_hash = self.library.index.content_hash(config_file, (st.st_mtime_ns, st.st_size))
+                if content_hash is None:
+                    with open(config_file, 'rb') as f:
+                        raw = f.read()
+                    content_hash = hashlib.sha256(raw).hexdigest()
+
+                # Previously seen content skips reading, formatting and lexing
+                cached = self.preview_cache.get(content_hash)
+                if cached is not None:
+                    self.insert_json_with_highlighting(*cached)
+                    return
+
+                if raw is None:
+                    with open(config_file, 'rb') as f:
+                        raw = f.read()
+                content = raw.decode('utf-8').replace('\r\n', '\n')
                 try:
                     json_data = json.loads(content)
                     formatted_content = json.dumps(json_data, indent=2, ensure_ascii=False)
-                    self.insert_json_with_highlighting(formatted_content)
+                    spans = compute_json_spans(formatted_content)
+                    self.insert_json_with_highlighting(formatted_content, spans)
+                    self.preview_cache.put(content_hash, formatted_content, spans)
                 except json.JSONDecodeError:
                     self.preview_textbox.insert("1.0", content)
 
         except Exception:
             self.update_status("Error reading file", COLORS["accent_red"])
 
-    def insert_json_with_highlighting(self, json_content):
-        """Insert JSON content with syntax highlighting"""
-        import re
-        
+    def load_more_preview(self):
+        """Append the next chunk of lines from the large file being previewed"""
+        if self.preview_reader is None:
+            return
+        try:
+            self.preview_textbox.insert("end", self.preview_reader.read_lines())
+        except Exception:
+            self.update_status("Error reading file", COLORS["accent_red"])
+            self.close_preview_reader()
+            return
+
+        if self.preview_reader.exhausted:
+            self.close_preview_reader()
+        elif not self.load_more_btn.winfo_ismapped():
+            self.load_more_btn.pack(side="bottom", fill="x", pady=(4, 0), before=self.preview_textbox)
+
+    def close_preview_reader(self):
+        if self.preview_reader is not None:
+            self.preview_reader.close()
+            self.preview_reader = None
+        self.load_more_btn.pack_forget()
+
+    def insert_json_with_highlighting(self, json_content, spans=None):
+        """Insert JSON content with syntax highlighting, lexing it only when no cached spans are given"""
         # Define color scheme for JSON syntax highlighting based on current theme
         self.update_json_highlighting_colors()
-        
+
         # Insert the content
         self.preview_textbox.insert("1.0", json_content)
-        
-        # Apply highlighting using regex patterns
-        content = json_content
-        
-        # Keep track of string positions to avoid re-highlighting them
-        string_ranges = []
-        
-        # First pass: Highlight strings (including keys and values)
-        for match in re.finditer(r'"([^"\\\\]|\\\\.)*"', content):
-            start_idx = f"1.0+{match.start()}c"
-            end_idx = f"1.0+{match.end()}c"
-            string_ranges.append((match.start(), match.end()))
-            
-            # Check if this string is a key (followed by colon)
-            rest_content = content[match.end():].lstrip()
-            if rest_content.startswith(':'):
-                self.preview_textbox.tag_add("key", start_idx, end_idx)
-            else:
-                self.preview_textbox.tag_add("string", start_idx, end_idx)
-        
-        # Helper function to check if position is inside a string
-        def is_in_string(pos):
-            for start, end in string_ranges:
-                if start <= pos < end:
-                    return True
-            return False
-        
-        # Highlight numbers (only outside strings)
-        for match in re.finditer(r'-?\d+\.?\d*([eE][+-]?\d+)?', content):
-            if not is_in_string(match.start()):
-                start_idx = f"1.0+{match.start()}c"
-                end_idx = f"1.0+{match.end()}c"
-                self.preview_textbox.tag_add("number", start_idx, end_idx)
-        
-        # Highlight booleans and null (only outside strings)
-        for match in re.finditer(r'\b(true|false|null)\b', content):
-            if not is_in_string(match.start()):
-                start_idx = f"1.0+{match.start()}c"
-                end_idx = f"1.0+{match.end()}c"
-                if match.group(1) in ['true', 'false']:
-                    self.preview_textbox.tag_add("boolean", start_idx, end_idx)
-                else:
-                    self.preview_textbox.tag_add("null", start_idx, end_idx)
-        
-        # Highlight braces and brackets (only outside strings)
-        for match in re.finditer(r'[{}]', content):
-            if not is_in_string(match.start()):
-                start_idx = f"1.0+{match.start()}c"
-                end_idx = f"1.0+{match.end()}c"
-                self.preview_textbox.tag_add("brace", start_idx, end_idx)
-            
-        for match in re.finditer(r'[\[\]]', content):
-            if not is_in_string(match.start()):
-                start_idx = f"1.0+{match.start()}c"
-                end_idx = f"1.0+{match.end()}c"
-                self.preview_textbox.tag_add("bracket", start_idx, end_idx)
-        
-        # Highlight colons and commas (only outside strings)
-        for match in re.finditer(r':', content):
-            if not is_in_string(match.start()):
-                start_idx = f"1.0+{match.start()}c"
-                end_idx = f"1.0+{match.end()}c"
-                self.preview_textbox.tag_add("colon", start_idx, end_idx)
-            
-        for match in re.finditer(r',', content):
-            if not is_in_string(match.start()):
-                start_idx = f"1.0+{match.start()}c"
-                end_idx = f"1.0+{match.end()}c"
-                self.preview_textbox.tag_add("comma", start_idx, end_idx)
+
+        if spans is None:
+            spans = compute_json_spans(json_content)
+        for i in range(0, len(spans), 3):
+            start_idx = f"1.0+{spans[i + 1]}c"
+            end_idx = f"1.0+{spans[i + 2]}c"
+            self.preview_textbox.tag_add(HIGHLIGHT_TAGS[spans[i]], start_idx, end_idx)
 
     def switch_config(self):
         if not self.selected_config:
             self.update_status("Please select a config first", COLORS["accent_red"])
             return
 
-        if self.selected_config.name == "settings.json":
+        if self.selected_config == self.settings_file:
             self.update_status("Already the active config", COLORS["text_muted"])
             return
 
@@ -542,13 +1918,68 @@ class ClaudeConfigSwitcher:
             return
 
         try:
-            shutil.copy2(self.selected_config, self.settings_file)
-            self.update_status(f"Switched to {self.selected_config.name}", COLORS["success_green"])
+            self.library.activate(self.selected_config)
+            self.update_status(f"Switched to {self.library.profile_label(self.selected_config)}", COLORS["success_green"])
             self.refresh_config_list()
 
+        except LockTimeout:
+            self.update_status("Settings busy, try again", COLORS["warning_orange"])
         except Exception:
             self.update_status("Switch failed", COLORS["accent_red"])
 
+    def export_profiles(self):
+        """Export the ~/.claude profiles (not the active settings.json) to a zip archive"""
+        from tkinter import filedialog
+
+        profile_files = []
+        for profile in self.config_files:
+            path = profile_file(profile)
+            if path.parent == self.claude_dir and path != self.settings_file and path not in profile_files:
+                profile_files.append(path)
+        if not profile_files:
+            self.update_status("No profiles to export", COLORS["text_muted"])
+            return
+
+        archive_path = filedialog.asksaveasfilename(
+            parent=self.root,
+            title="Export profiles",
+            defaultextension=".zip",
+            initialfile=f"cc-profiles-{datetime.now():%Y%m%d}.zip",
+            filetypes=[("Profile archive", "*.zip")]
+        )
+        if not archive_path:
+            return
+        try:
+            count = export_profiles(archive_path, profile_files)
+            self.update_status(f"Exported {count} profiles", COLORS["success_green"])
+        except (OSError, zipfile.BadZipFile):
+            self.update_status("Export failed", COLORS["accent_red"])
+
+    def import_profiles(self):
+        """Import profiles from an archive into ~/.claude, then refresh the list once"""
+        from tkinter import filedialog
+
+        archive_path = filedialog.askopenfilename(
+            parent=self.root,
+            title="Import profiles",
+            filetypes=[("Profile archive", "*.zip")]
+        )
+        if not archive_path:
+            return
+
+        known_hashes = {entry["hash"] for entry in self.library.index.entries.values() if entry["hash"]}
+        try:
+            imported, skipped = import_profiles(archive_path, self.claude_dir, known_hashes)
+        except LockTimeout:
+            self.update_status("Settings busy, try again", COLORS["warning_orange"])
+            return
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            self.update_status("Import failed: invalid archive", COLORS["accent_red"])
+            return
+
+        self.refresh_config_list()
+        self.update_status(f"Imported {len(imported)}, skipped {skipped} existing", COLORS["success_green"])
+
     def open_config_directory(self):
         try:
             os.startfile(self.claude_dir)
@@ -578,41 +2009,20 @@ class ClaudeConfigSwitcher:
                 self.update_status("Directory not found", COLORS["accent_red"])
                 return
 
+            # Incremental scan of all profile sources; unchanged files are not re-read
+            self.config_files = self.library.scan()
+            settings_file_path = self.settings_file if self.settings_file in self.config_files else None
+
             # Get content of settings.json for comparison
-            settings_content = None
-            if self.settings_file.exists():
-                try:
-                    with open(self.settings_file, 'r', encoding='utf-8') as f:
-                        settings_content = json.load(f)
-                except (json.JSONDecodeError, IOError):
-                    settings_content = None  # Mark as not readable
-
-            # Scan for settings-related config files and sort them with settings.json on top
-            other_files = []
-            settings_file_path = None
-            for file_path in self.claude_dir.glob("*.json"):
-                file_name = file_path.name.lower()
-                # Filter to only include settings-related files
-                if (file_name == "settings.json" or 
-                    "settings" in file_name or 
-                    file_name.startswith("settings_") or
-                    file_name.endswith("_settings.json")):
-                    
-                    if file_path.name == "settings.json":
-                        settings_file_path = file_path
-                    else:
-                        other_files.append(file_path)
-
-            other_files.sort()
-
-            if settings_file_path:
-                self.config_files.append(settings_file_path)
-            self.config_files.extend(other_files)
+            settings_content = self.library.index.data(self.settings_file)
 
             # Create config buttons
             for config_file in self.config_files:
                 self.create_config_button(config_file, settings_content)
 
+            self.apply_search_filter()
+            self.start_latency_probe()
+
             if is_initial:
                 # Initial load: Restore last selection or default to settings.json
                 app_state = self.load_app_state()
@@ -622,7 +2032,7 @@ class ClaudeConfigSwitcher:
                 # Try to find the last selected file
                 if last_selected:
                     for config_file in self.config_files:
-                        if config_file.name == last_selected:
+                        if self.library.profile_key(config_file) == last_selected:
                             target_file = config_file
                             break
                 
@@ -638,13 +2048,121 @@ class ClaudeConfigSwitcher:
                 if current_selection and current_selection.exists():
                     # Find the corresponding file in the new list
                     for config_file in self.config_files:
-                        if config_file.name == current_selection.name:
+                        if config_file == current_selection:
                             self.select_config(config_file)
                             break
                 
         except Exception as e:
             self.update_status(f"Error loading configs: {str(e)}", COLORS["accent_red"])
 
+    def apply_search_filter(self):
+        """Show only the cards whose profile matches the search box, using the in-memory index"""
+        query = self.search_entry.get()
+        cards = [child for child in self.config_listbox.winfo_children() if hasattr(child, '_config_file')]
+        for card in cards:
+            card.pack_forget()
+        for card in cards:
+            if self.library.index.matches(card._config_file, query):
+                card.pack(fill="x", pady=(0, 1), padx=0)
+
+    def start_latency_probe(self, on_done=None):
+        """Probe stale endpoints of all profiles on a background thread, then refresh the badges"""
+        if self.probe_thread is None or not self.probe_thread.is_alive():
+            urls = [url for url in map(self.library.profile_base_url, self.config_files) if url]
+            if not self.latency_cache.stale(urls):
+                if on_done:
+                    on_done()
+                return
+            self.probe_thread = threading.Thread(target=self.latency_cache.probe, args=(urls,), daemon=True)
+            self.probe_thread.start()
+        self.root.after(100, lambda: self.wait_for_probe(on_done))
+
+    def wait_for_probe(self, on_done=None):
+        if self.probe_thread is not None and self.probe_thread.is_alive():
+            self.root.after(100, lambda: self.wait_for_probe(on_done))
+            return
+        for card in self.config_listbox.winfo_children():
+            if hasattr(card, '_latency_label'):
+                self.update_latency_badge(card)
+        if on_done:
+            on_done()
+
+    def update_latency_badge(self, card):
+        url = self.library.profile_base_url(card._config_file)
+        result = self.latency_cache.get(url) if url else None
+        label = card._latency_label
+        if result is None:
+            return
+        if result["healthy"]:
+            latency_ms = result["first_byte"] * 1000
+            color = COLORS["success_green"] if latency_ms < 300 else COLORS["warning_orange"]
+            label.configure(text=f"{latency_ms:.0f}ms", text_color=color)
+        else:
+            label.configure(text="down", text_color=COLORS["accent_red"])
+        if not label.winfo_ismapped():
+            label.pack(side="right", padx=(6, 0))
+
+    def switch_to_fastest(self):
+        """Switch to the profile whose endpoint answered fastest, probing first if results are stale"""
+        self.update_status("Probing endpoints...", COLORS["text_muted"])
+        self.start_latency_probe(on_done=self.apply_fastest)
+
+    def apply_fastest(self):
+        best, best_latency = None, None
+        for config_file in self.config_files:
+            url = self.library.profile_base_url(config_file)
+            result = self.latency_cache.get(url) if url else None
+            if result is None or not result["healthy"]:
+                continue
+            if best_latency is None or result["first_byte"] < best_latency:
+                best, best_latency = config_file, result["first_byte"]
+
+        if best is None:
+            self.update_status("No healthy endpoint found", COLORS["accent_red"])
+            return
+        if self.library.profile_base_url(best) == self.library.profile_base_url(self.settings_file):
+            self.update_status("Already on the fastest endpoint", COLORS["text_muted"])
+            return
+        self.select_config(best)
+        self.switch_config()
+
+    def poll_commands(self):
+        """Apply queued commands on the Tk thread"""
+        try:
+            while True:
+                command = self.command_queue.get_nowait()
+                if command[0] == "quit":
+                    # Leave it queued for resident mode, which owns the process
+                    self.command_queue.put(command)
+                    self.root.destroy()
+                    return
+                self.handle_command(command)
+        except queue.Empty:
+            pass
+        self.root.after(100, self.poll_commands)
+
+    def handle_command(self, command):
+        if command[0] == "switch" and len(command) > 1:
+            self.show_window()
+            profile = self.library.find_profile(command[1])
+            if profile is None:
+                self.update_status(f"Profile not found: {command[1]}", COLORS["accent_red"])
+                return
+            self.select_config(profile)
+            self.switch_config()
+        elif command[0] == "next":
+            profile = self.library.next_profile(self.load_app_state()['active_profile'])
+            if profile is not None:
+                self.select_config(profile)
+                self.switch_config()
+        elif command[0] == "show":
+            self.show_window()
+
+    def show_window(self):
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+
     def run(self):
         self.root.mainloop()
 
@@ -681,7 +2199,8 @@ class ClaudeConfigSwitcher:
         self.toolbar.configure(fg_color=COLORS["bg_secondary"])
         
         # Update toolbar buttons
-        toolbar_buttons = [self.sync_btn, self.theme_btn, self.settings_btn]
+        toolbar_buttons = [self.sync_btn, self.fastest_btn, self.export_btn, self.import_btn,
+                           self.theme_btn, self.settings_btn]
         for btn in toolbar_buttons:
             btn.configure(
                 hover_color=COLORS["card_hover"],
@@ -691,11 +2210,19 @@ class ClaudeConfigSwitcher:
         # Update left panel
         self.left_panel.configure(fg_color=COLORS["bg_secondary"])
         
+        # Update search box
+        self.search_entry.configure(
+            fg_color=COLORS["bg_tertiary"],
+            text_color=COLORS["text_primary"],
+            placeholder_text_color=COLORS["text_muted"],
+            border_color=COLORS["border"]
+        )
+
         # Update status label
         self.status_label.configure(text_color=COLORS["text_muted"])
         
         # Update action buttons
-        action_buttons = [self.switch_btn, self.refresh_btn, self.open_dir_btn]
+        action_buttons = [self.switch_btn, self.refresh_btn, self.open_dir_btn, self.load_more_btn]
         for btn in action_buttons:
             btn.configure(
                 fg_color=COLORS["bg_tertiary"],
@@ -759,9 +2286,237 @@ class ClaudeConfigSwitcher:
         self.update_status("WebDAV sync feature coming soon", COLORS["text_muted"])
 
 
+def parse_hotkey(spec):
+    """Turn a hotkey like 'ctrl+alt+s' into (modifiers, virtual key code) for RegisterHotKey"""
+    modifier_bits = {"alt": 0x1, "ctrl": 0x2, "control": 0x2, "shift": 0x4, "win": 0x8}
+    modifiers = 0
+    key = None
+    for part in spec.lower().replace(" ", "").split("+"):
+        if part in modifier_bits:
+            modifiers |= modifier_bits[part]
+        elif len(part) == 1 and part.isalnum():
+            key = ord(part.upper())
+        elif part.startswith("f") and part[1:].isdigit() and 1 <= int(part[1:]) <= 24:
+            key = 0x6F + int(part[1:])  # VK_F1 is 0x70
+        else:
+            raise ValueError(f"Unsupported hotkey: {spec}")
+    if key is None:
+        raise ValueError(f"Hotkey has no key: {spec}")
+    return modifiers, key
+
+
+class GlobalHotkey:
+    """System-wide hotkey (Windows RegisterHotKey) that queues a command each time it is pressed"""
+
+    def __init__(self, spec, commands, command):
+        self.modifiers, self.key = parse_hotkey(spec)
+        self.commands = commands
+        self.command = command
+
+    def start(self):
+        """Listen on a background thread; returns False where global hotkeys aren't supported"""
+        if sys.platform != "win32":
+            return False
+        threading.Thread(target=self._run, daemon=True).start()
+        return True
+
+    def _run(self):
+        import ctypes
+        from ctypes import wintypes
+
+        mod_norepeat = 0x4000
+        wm_hotkey = 0x0312
+        user32 = ctypes.windll.user32
+        # The hotkey belongs to the registering thread, so the message loop has to run here too
+        if not user32.RegisterHotKey(None, 1, self.modifiers | mod_norepeat, self.key):
+            return
+        try:
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                if msg.message == wm_hotkey:
+                    self.commands.put(self.command)
+        finally:
+            user32.UnregisterHotKey(None, 1)
+
+
+class ResidentSwitcher:
+    """Background mode: keeps the profile index warm and only creates the window when asked"""
+
+    def __init__(self, command_queue, claude_dir=CLAUDE_DIR):
+        self.commands = command_queue
+        self.claude_dir = claude_dir
+        self.app_state_file = claude_dir / ".cc-cache"
+        app_state = read_app_state(self.app_state_file)
+        self.library = ProfileLibrary(claude_dir, app_state['profile_sources'])
+        self.active_key = app_state['active_profile']
+        # The active_key last written to .cc-cache
+        self.saved_key = self.active_key
+        self.hotkey_spec = app_state['hotkey']
+        self.tray = None
+
+    def run(self):
+        self.library.scan()
+        self.start_tray()
+        try:
+            GlobalHotkey(self.hotkey_spec, self.commands, ["next"]).start()
+        except ValueError:
+            pass  # Bad hotkey in app state; the tray and command line still work
+
+        while True:
+            try:
+                command = self.commands.get(timeout=RESIDENT_RESCAN_INTERVAL)
+            except queue.Empty:
+                # Stat-only resync so the next switch never has to scan or parse
+                self.library.scan()
+                self.update_tray()
+                self.save_active_profile()
+                continue
+
+            if command[0] == "quit":
+                break
+            elif command[0] == "show":
+                self.show_window()
+            elif command[0] == "switch" and len(command) > 1:
+                self.switch(self.library.find_profile(command[1]))
+            elif command[0] == "next":
+                self.switch(self.library.next_profile(self.active_key))
+
+        self.save_active_profile()
+        if self.tray is not None:
+            self.tray.stop()
+
+    def switch(self, profile):
+        """Switch using the warm index: one locked atomic write of settings.json"""
+        if profile is None:
+            return
+        try:
+            self.library.activate(profile, record=False)
+        except (OSError, ValueError):
+            return
+        self.active_key = self.library.profile_key(profile)
+        self.update_tray()
+
+    def show_window(self):
+        """Open the full window on the warm library; returns when it is closed"""
+        # The window reads the active profile from app state
+        self.save_active_profile()
+        app = ClaudeConfigSwitcher(command_queue=self.commands, library=self.library)
+        app.run()
+        # The window may have switched profiles while it was open
+        self.active_key = self.saved_key = read_app_state(self.app_state_file)['active_profile']
+        self.update_tray()
+
+    def save_active_profile(self):
+        """Write active_key to .cc-cache if it changed; runs when idle, before the window opens and on exit"""
+        if self.active_key == self.saved_key:
+            return
+        active_key = self.active_key
+        try:
+            update_json_file(self.app_state_file, lambda state: state.update(active_profile=active_key),
+                             state_lock(self.claude_dir))
+        except OSError:
+            return  # Busy or unwritable; retried on the next idle tick
+        self.saved_key = active_key
+
+    def start_tray(self):
+        """Show a tray icon with a profile menu if pystray and Pillow are installed"""
+        try:
+            import pystray
+            from PIL import Image, ImageDraw
+        except ImportError:
+            return  # The tray is optional; the hotkey and command line still work
+
+        image = Image.new("RGB", (64, 64), DARK_COLORS["bg_primary"])
+        ImageDraw.Draw(image).ellipse((12, 12, 52, 52), fill=DARK_COLORS["accent_primary"])
+
+        def queue_command(*command):
+            return lambda: self.commands.put(list(command))
+
+        def is_active(key):
+            return lambda item: key == self.active_key
+
+        def menu_items():
+            for profile in self.library.profiles:
+                if profile == self.library.settings_file:
+                    continue
+                key = self.library.profile_key(profile)
+                yield pystray.MenuItem(self.library.profile_label(profile), queue_command("switch", key),
+                                       checked=is_active(key), radio=True)
+            yield pystray.Menu.SEPARATOR
+            yield pystray.MenuItem("Open", queue_command("show"), default=True)
+            yield pystray.MenuItem("Quit", queue_command("quit"))
+
+        self.tray = pystray.Icon("cc-switcher", image, "cc switcher", menu=pystray.Menu(menu_items))
+        self.tray.run_detached()
+
+    def update_tray(self):
+        if self.tray is not None:
+            self.tray.update_menu()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="cc-switcher", description="Switch between Claude Code settings profiles")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("show", help="open the window (default)")
+    switch_parser = subparsers.add_parser("switch", help="switch to a profile by name")
+    switch_parser.add_argument("name", help="profile file name or card label, e.g. work_settings")
+    subparsers.add_parser("resident", help="stay in the background with a tray icon and global hotkey")
+    subparsers.add_parser("quit", help="stop the running instance")
+    return parser.parse_args(argv)
+
+
 def main():
-    app = ClaudeConfigSwitcher()
-    app.run()
+    args = parse_args()
+    if args.command == "switch":
+        command = ["switch", args.name]
+    elif args.command == "quit":
+        command = ["quit"]
+    else:
+        command = ["show"]
+
+    server = None
+    instance_lock = None
+    # build_exe.py's startup probe has to measure a real launch, not a handoff to a running app
+    if not os.environ.get("CC_SWITCHER_STARTUP_PROBE"):
+        # If an instance is already running, let it handle the command and exit
+        if forward_command(command) or command[0] == "quit":
+            return
+        try:
+            CLAUDE_DIR.mkdir(exist_ok=True)
+            # Whoever holds the instance lock for its lifetime is the running instance
+            instance_lock = FileLock(CLAUDE_DIR / ".cc-switcher.instance", timeout=0)
+            instance_lock.acquire()
+            server = InstanceServer()
+        except LockTimeout:
+            # Another launch won the election and is still starting its listener
+            for _ in range(INSTANCE_ELECTION_RETRIES):
+                if forward_command(command):
+                    return
+                time.sleep(0.1)
+            # Running anyway would race the instance on settings.json, so fail loudly instead
+            sys.exit(f"cc switcher: another instance holds {CLAUDE_DIR / '.cc-switcher.instance'} "
+                     f"but did not answer; '{' '.join(command)}' was not applied")
+        except OSError:
+            # No IPC available; run standalone without blocking later launches from electing themselves
+            if instance_lock is not None:
+                instance_lock.release()
+                instance_lock = None
+
+    command_queue = server.commands if server is not None else queue.Queue()
+    if command[0] != "show":
+        command_queue.put(command)
+
+    try:
+        if args.command == "resident":
+            ResidentSwitcher(command_queue).run()
+        else:
+            app = ClaudeConfigSwitcher(command_queue=command_queue)
+            app.run()
+    finally:
+        if server is not None:
+            server.close()
+        if instance_lock is not None:
+            instance_lock.release()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cc_switcher  # noqa: E402
+from cc_switcher import ARCHIVE_MANIFEST, export_profiles, import_profiles  # noqa: E402
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_archive(path, entries, manifest=None):
+    """Write a zip of {name: bytes}; the manifest defaults to the real hash of every entry"""
+    if manifest is None:
+        manifest = {name: sha256(data) for name, data in entries.items()}
+    with zipfile.ZipFile(path, 'w') as zf:
+        for name, data in entries.items():
+            zf.writestr(name, data)
+        zf.writestr(ARCHIVE_MANIFEST, json.dumps({"version": 1, "files": manifest}))
+    return path
+
+
+def profile_names(directory):
+    """Profile files in directory, ignoring the lock file and any leftover temp files"""
+    return sorted(path.name for path in directory.iterdir() if not path.name.startswith("."))
+
+
+@pytest.fixture
+def target(tmp_path):
+    directory = tmp_path / "target"
+    directory.mkdir()
+    return directory
+
+
+def test_round_trip_with_export_profiles(tmp_path, target):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "a_settings.json").write_bytes(b'{"env": {"A": "1"}}')
+    (source / "b_settings.json").write_bytes(b'{"env": {"B": "1"}}')
+    archive = tmp_path / "profiles.zip"
+
+    assert export_profiles(archive, sorted(source.iterdir())) == 2
+    imported, skipped = import_profiles(archive, target, set())
+
+    assert sorted(imported) == ["a_settings.json", "b_settings.json"] and skipped == 0
+    assert (target / "a_settings.json").read_bytes() == b'{"env": {"A": "1"}}'
+    assert list(target.glob("*.tmp")) == []
+
+
+def test_unsafe_and_unlisted_names_are_ignored(tmp_path, target):
+    data = b'{"env": {}}'
+    entries = {
+        "../escape_settings.json": data,
+        "nested/x_settings.json": data,
+        "notes.json": b'{"note": 1}',
+        "unlisted_settings.json": b'{"env": {"U": "1"}}',
+        "ok_settings.json": b'{"env": {"OK": "1"}}',
+    }
+    manifest = {name: sha256(value) for name, value in entries.items() if name != "unlisted_settings.json"}
+    archive = write_archive(tmp_path / "mixed.zip", entries, manifest)
+
+    imported, skipped = import_profiles(archive, target, set())
+
+    assert imported == ["ok_settings.json"] and skipped == 0
+    assert profile_names(target) == ["ok_settings.json"]
+    assert not (tmp_path / "escape_settings.json").exists()
+
+
+def test_active_settings_json_is_never_imported(tmp_path, target):
+    (target / "settings.json").write_bytes(b'{"env": {"LOCAL": "1"}}')
+    archive = write_archive(tmp_path / "active.zip", {"settings.json": b'{"env": {"REMOTE": "1"}}'})
+
+    assert import_profiles(archive, target, set()) == ([], 0)
+    assert (target / "settings.json").read_bytes() == b'{"env": {"LOCAL": "1"}}'
+
+
+def test_oversized_entry_is_rejected(tmp_path, target, monkeypatch):
+    monkeypatch.setattr(cc_switcher, "ARCHIVE_MAX_ENTRY_SIZE", 16)
+    archive = write_archive(tmp_path / "big.zip", {
+        "small_settings.json": b'{"env": {}}',
+        "big_settings.json": b'{"env": {"KEY": "' + b"x" * 64 + b'"}}',
+    })
+
+    with pytest.raises(ValueError, match="too large"):
+        import_profiles(archive, target, set())
+    # Nothing is moved into place when any entry fails
+    assert profile_names(target) == []
+    assert list(target.glob("*.tmp")) == []
+
+
+def test_checksum_mismatch_is_rejected(tmp_path, target):
+    entries = {"a_settings.json": b'{"env": {"A": "1"}}'}
+    archive = write_archive(tmp_path / "tampered.zip", entries, {"a_settings.json": sha256(b"something else")})
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        import_profiles(archive, target, set())
+    assert profile_names(target) == []
+    assert list(target.glob("*.tmp")) == []
+
+
+def test_name_clashes_get_numbered(tmp_path, target):
+    (target / "a_settings.json").write_bytes(b'{"env": {"LOCAL": "1"}}')
+    (target / "a_settings-1.json").write_bytes(b'{"env": {"LOCAL": "2"}}')
+    (target / "t_settings.template.json").write_bytes(b'{"local": true}')
+    archive = write_archive(tmp_path / "clash.zip", {
+        "a_settings.json": b'{"env": {"REMOTE": "1"}}',
+        "t_settings.template.json": b'{"remote": true}',
+    })
+
+    imported, _ = import_profiles(archive, target, set())
+
+    assert sorted(imported) == ["a_settings-2.json", "t_settings-1.template.json"]
+    assert (target / "a_settings.json").read_bytes() == b'{"env": {"LOCAL": "1"}}'
+    assert (target / "a_settings-2.json").read_bytes() == b'{"env": {"REMOTE": "1"}}'
+
+
+def test_known_and_duplicate_content_is_skipped(tmp_path, target):
+    known = b'{"env": {"KNOWN": "1"}}'
+    fresh = b'{"env": {"FRESH": "1"}}'
+    archive = write_archive(tmp_path / "dupes.zip", {
+        "known_settings.json": known,
+        "fresh_settings.json": fresh,
+        "fresh_copy_settings.json": fresh,
+    })
+
+    imported, skipped = import_profiles(archive, target, {sha256(known)})
+
+    assert imported == ["fresh_settings.json"]
+    assert skipped == 2
+    assert profile_names(target) == ["fresh_settings.json"]
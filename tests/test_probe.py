@@ -0,0 +1,128 @@
+import asyncio
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cc_switcher  # noqa: E402
+from cc_switcher import LatencyCache, probe_endpoints  # noqa: E402
+
+SLOW_DELAY = 0.2
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answer HEAD requests with the status encoded in the path; /slow waits before answering"""
+
+    def do_HEAD(self):
+        if self.path == "/slow":
+            time.sleep(SLOW_DELAY)
+            status = 200
+        else:
+            status = int(self.path.strip("/"))
+        self.send_response(status)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def refused_url():
+    # Bind and release a port so nothing is listening on it
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def test_probe_endpoints_reports_status_and_health(stub_url, refused_url):
+    urls = [f"{stub_url}/slow", f"{stub_url}/404", f"{stub_url}/503", refused_url]
+    results = asyncio.run(probe_endpoints(urls, concurrency=2, timeout=2.0))
+
+    assert list(results) == urls
+
+    slow = results[f"{stub_url}/slow"]
+    assert slow["status"] == 200 and slow["healthy"] and slow["error"] is None
+    assert slow["connect"] is not None and slow["tls"] is None
+    assert slow["first_byte"] >= SLOW_DELAY
+
+    not_found = results[f"{stub_url}/404"]
+    assert not_found["status"] == 404 and not_found["healthy"]
+
+    unavailable = results[f"{stub_url}/503"]
+    assert unavailable["status"] == 503 and not unavailable["healthy"]
+
+    refused = results[refused_url]
+    assert refused["status"] is None and not refused["healthy"]
+    assert refused["connect"] is None and refused["error"]
+
+
+def test_probe_endpoints_times_out(stub_url):
+    results = asyncio.run(probe_endpoints([f"{stub_url}/slow"], timeout=SLOW_DELAY / 4))
+    result = results[f"{stub_url}/slow"]
+    assert result["first_byte"] is None and not result["healthy"]
+    assert result["error"] == "TimeoutError"
+
+
+def test_probe_endpoint_rejects_unsupported_url():
+    result = asyncio.run(probe_endpoints(["ftp://example.invalid"]))["ftp://example.invalid"]
+    assert not result["healthy"] and "Unsupported URL" in result["error"]
+
+
+def test_latency_cache_reuses_fresh_results(stub_url, monkeypatch):
+    calls = []
+    real_probe = cc_switcher.probe_endpoints
+
+    async def counting_probe(urls, concurrency, timeout):
+        calls.append(list(urls))
+        return await real_probe(urls, concurrency, timeout)
+
+    monkeypatch.setattr(cc_switcher, "probe_endpoints", counting_probe)
+    url = f"{stub_url}/404"
+    cache = LatencyCache(ttl=60)
+
+    assert cache.get(url) is None
+    assert cache.stale([url, url]) == [url]
+
+    first = cache.probe([url])
+    assert first[url]["status"] == 404
+    assert cache.stale([url]) == []
+    assert cache.probe([url]) == first
+    assert calls == [[url]]
+
+
+def test_latency_cache_expires_after_ttl(stub_url, monkeypatch):
+    # Shift the clock rather than freezing it, so the event loop keeps working
+    real_monotonic = time.monotonic
+    offset = [0.0]
+    monkeypatch.setattr(cc_switcher.time, "monotonic", lambda: real_monotonic() + offset[0])
+    url = f"{stub_url}/404"
+    cache = LatencyCache(ttl=30)
+
+    cache.probe([url])
+    offset[0] += 25
+    assert cache.get(url) is not None
+
+    offset[0] += 10
+    assert cache.get(url) is None
+    assert cache.stale([url]) == [url]
+
+    refreshed = cache.probe([url])
+    assert refreshed[url]["status"] == 404
+    assert cache.stale([url]) == []